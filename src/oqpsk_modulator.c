@@ -205,13 +205,16 @@ uint32_t oqpsk_modulate_frame(const uint8_t *frame_bits,
     // DEBUG: Dump chips after spreading (before interpolation)
     FILE *chip_dump = fopen("chips_after_spreading.bin", "wb");
     if (chip_dump) {
-        // Format: interleaved I/Q chips as int8_t
-        for (int i = 0; i < 38400; i++) {
-            fwrite(&i_prn[i], sizeof(int8_t), 1, chip_dump);
-            fwrite(&q_prn[i], sizeof(int8_t), 1, chip_dump);
-        }
+        // Format: header byte 0x50 (SoA), then 38,400 I chips followed by
+        // 38,400 Q chips as int8_t. SoA keeps each channel contiguous for
+        // the verifier's despreading pass; headerless 76,800-byte dumps
+        // remain readable as legacy interleaved AoS (0xA0 reserved).
+        uint8_t layout = 0x50;
+        fwrite(&layout, sizeof(uint8_t), 1, chip_dump);
+        fwrite(i_prn, sizeof(int8_t), 38400, chip_dump);
+        fwrite(q_prn, sizeof(int8_t), 38400, chip_dump);
         fclose(chip_dump);
-        printf("  [DEBUG] Chips dumped to chips_after_spreading.bin (76,800 bytes)\n");
+        printf("  [DEBUG] Chips dumped to chips_after_spreading.bin (76,801 bytes, SoA)\n");
     }
 
     // Generate I/Q samples with OQPSK (Q delayed by Tc/2)
@@ -6,10 +6,65 @@ Affiche le spectre, la constellation OQPSK, et le diagramme œil
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from scipy.fft import fftshift
+from scipy.signal import welch
+import math
 import wave
 import sys
 import argparse
 
+try:
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def _stats(x):
+        """Min/max/moyenne/écart-type en un seul passage mémoire"""
+        mn = x[0]
+        mx = x[0]
+        s = 0.0
+        s2 = 0.0
+        for v in x:
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+            s += v
+            s2 += v * v
+        n = x.size
+        mean = s / n
+        var = s2 / n - mean * mean
+        return mn, mx, mean, math.sqrt(var if var > 0.0 else 0.0)
+
+    @njit(cache=True, fastmath=True)
+    def _mag_stats(iq):
+        """Statistiques de |iq| sans allouer le tableau de magnitude"""
+        m0 = abs(iq[0])
+        mn = m0
+        mx = m0
+        s = 0.0
+        s2 = 0.0
+        for v in iq:
+            m = abs(v)
+            if m < mn:
+                mn = m
+            if m > mx:
+                mx = m
+            s += m
+            s2 += m * m
+        n = iq.size
+        mean = s / n
+        var = s2 / n - mean * mean
+        return mn, mx, mean, math.sqrt(var if var > 0.0 else 0.0)
+
+except ImportError:
+    # numba est optionnel: repli sur les réductions NumPy (multi-passes)
+    def _stats(x):
+        return float(x.min()), float(x.max()), float(x.mean()), float(x.std())
+
+    def _mag_stats(iq):
+        return _stats(np.abs(iq))
+
 def read_wav_iq(filename):
     """Lit un fichier WAV stéréo I/Q"""
     with wave.open(filename, 'rb') as wav:
@@ -21,27 +76,30 @@ def read_wav_iq(filename):
         data = np.frombuffer(frames, dtype=np.int16)
 
     if n_channels == 2:
-        # Stéréo: I sur gauche, Q sur droite
-        i_samples = data[0::2] / 32768.0
-        q_samples = data[1::2] / 32768.0
+        # Stéréo: I sur gauche, Q sur droite — l'entrelacement I,Q,I,Q...
+        # en float32 est déjà la disposition mémoire de complex64:
+        # réinterprétation sans copie via view()
+        iq = (data.astype(np.float32) * np.float32(1.0 / 32768.0))
+        iq = iq.reshape(-1, 2).view(np.complex64).reshape(-1)
     else:
         # Mono: utiliser comme I, Q = 0
-        i_samples = data / 32768.0
-        q_samples = np.zeros_like(i_samples)
-
-    # Former les échantillons complexes
-    iq = i_samples + 1j * q_samples
+        iq = (data.astype(np.float32) * np.float32(1.0 / 32768.0)).astype(np.complex64)
 
     return iq, sample_rate
 
 def plot_spectrum(iq, sample_rate):
-    """Trace le spectre de puissance"""
-    # Calculer la FFT
-    fft = np.fft.fftshift(np.fft.fft(iq))
-    freq = np.fft.fftshift(np.fft.fftfreq(len(iq), 1/sample_rate))
+    """Trace le spectre de puissance (méthode de Welch)"""
+    # Moyenne de FFT courtes (4096 points, cache-résidentes) au lieu
+    # d'une seule FFT géante sur tout le fichier: plus rapide et estimée
+    # plus propre
+    nperseg = min(4096, len(iq))
+    freq, pxx = welch(np.asarray(iq, dtype=np.complex64), fs=sample_rate,
+                      nperseg=nperseg, return_onesided=False, detrend=False)
+    freq = fftshift(freq)
+    pxx = fftshift(pxx)
 
     # Puissance en dB
-    power_db = 20 * np.log10(np.abs(fft) + 1e-10)
+    power_db = 10 * np.log10(pxx + 1e-20)
 
     plt.subplot(2, 2, 1)
     plt.plot(freq/1000, power_db, linewidth=0.5)
@@ -66,7 +124,9 @@ def plot_constellation(iq, max_points=10000):
     iq_sample = iq[::step]
 
     plt.subplot(2, 2, 2)
-    plt.plot(np.real(iq_sample), np.imag(iq_sample), '.', markersize=1, alpha=0.3)
+    # Rastériser le nuage de points (les axes restent vectoriels)
+    plt.plot(np.real(iq_sample), np.imag(iq_sample), '.', markersize=1, alpha=0.3,
+             rasterized=True)
     plt.xlabel('I (In-phase)')
     plt.ylabel('Q (Quadrature)')
     plt.title('Constellation OQPSK')
@@ -86,13 +146,21 @@ def plot_eye_diagram(iq, samples_per_symbol=2667):
     n_symbols = len(signal) // samples_per_symbol
     n_symbols = min(n_symbols, 100)  # Limiter pour la lisibilité
 
-    plt.subplot(2, 2, 3)
-
-    for i in range(n_symbols):
-        start = i * samples_per_symbol
-        end = start + samples_per_symbol
-        if end <= len(signal):
-            plt.plot(signal[start:end], 'b-', alpha=0.1, linewidth=0.5)
+    ax = plt.subplot(2, 2, 3)
+
+    if n_symbols > 0:
+        # Découper en segments (n_symbols, samples_per_symbol) et tout tracer
+        # en un seul artiste (LineCollection) au lieu de 100 appels plt.plot.
+        # Les sommets sont assemblés en un seul tableau (n, m, 2) par
+        # affectations vectorisées — aucune boucle Python sur les symboles
+        segments = signal[:n_symbols * samples_per_symbol].reshape(n_symbols, samples_per_symbol)
+        verts = np.empty((n_symbols, samples_per_symbol, 2), dtype=np.float32)
+        verts[:, :, 0] = np.arange(samples_per_symbol)
+        verts[:, :, 1] = segments
+        ax.add_collection(LineCollection(verts, colors='b', alpha=0.1, linewidths=0.5,
+                                         rasterized=True))
+        ax.set_xlim(0, samples_per_symbol - 1)
+        ax.set_ylim(segments.min(), segments.max())
 
     plt.xlabel('Échantillons par symbole')
     plt.ylabel('Amplitude I')
@@ -108,8 +176,10 @@ def plot_time_domain(iq, sample_rate, duration=0.01):
     time = np.arange(n_samples) / sample_rate * 1000  # en ms
 
     plt.subplot(2, 2, 4)
-    plt.plot(time, np.real(iq[:n_samples]), 'b-', label='I', linewidth=0.5, alpha=0.7)
-    plt.plot(time, np.imag(iq[:n_samples]), 'r-', label='Q', linewidth=0.5, alpha=0.7)
+    plt.plot(time, np.real(iq[:n_samples]), 'b-', label='I', linewidth=0.5, alpha=0.7,
+             rasterized=True)
+    plt.plot(time, np.imag(iq[:n_samples]), 'r-', label='Q', linewidth=0.5, alpha=0.7,
+             rasterized=True)
     plt.xlabel('Temps (ms)')
     plt.ylabel('Amplitude')
     plt.title(f'Signal temporel (premiers {duration*1000:.0f} ms)')
@@ -118,9 +188,14 @@ def plot_time_domain(iq, sample_rate, duration=0.01):
 
 def print_statistics(iq, sample_rate):
     """Affiche les statistiques du signal"""
-    magnitude = np.abs(iq)
     phase = np.angle(iq)
 
+    # Un seul passage mémoire par composante (et la magnitude est
+    # calculée au vol, sans buffer intermédiaire)
+    i_min, i_max, i_mean, i_std = _stats(np.ascontiguousarray(np.real(iq)))
+    q_min, q_max, q_mean, q_std = _stats(np.ascontiguousarray(np.imag(iq)))
+    mag_min, mag_max, mag_mean, mag_std = _mag_stats(iq)
+
     print("\n" + "="*70)
     print(" STATISTIQUES DU SIGNAL T.018")
     print("="*70)
@@ -131,28 +206,26 @@ def print_statistics(iq, sample_rate):
     print(f"  Durée:              {len(iq)/sample_rate:.3f} secondes")
 
     print(f"\n📈 Composante I (In-phase):")
-    i_samples = np.real(iq)
-    print(f"  Min:                {i_samples.min():+.6f}")
-    print(f"  Max:                {i_samples.max():+.6f}")
-    print(f"  Moyenne:            {i_samples.mean():+.6f}")
-    print(f"  Écart-type:         {i_samples.std():.6f}")
+    print(f"  Min:                {i_min:+.6f}")
+    print(f"  Max:                {i_max:+.6f}")
+    print(f"  Moyenne:            {i_mean:+.6f}")
+    print(f"  Écart-type:         {i_std:.6f}")
 
     print(f"\n📉 Composante Q (Quadrature):")
-    q_samples = np.imag(iq)
-    print(f"  Min:                {q_samples.min():+.6f}")
-    print(f"  Max:                {q_samples.max():+.6f}")
-    print(f"  Moyenne:            {q_samples.mean():+.6f}")
-    print(f"  Écart-type:         {q_samples.std():.6f}")
+    print(f"  Min:                {q_min:+.6f}")
+    print(f"  Max:                {q_max:+.6f}")
+    print(f"  Moyenne:            {q_mean:+.6f}")
+    print(f"  Écart-type:         {q_std:.6f}")
 
     print(f"\n📐 Magnitude (Enveloppe):")
-    print(f"  Min:                {magnitude.min():.6f}")
-    print(f"  Max:                {magnitude.max():.6f}")
-    print(f"  Moyenne:            {magnitude.mean():.6f}")
-    print(f"  Écart-type:         {magnitude.std():.6f}")
-    print(f"  Variation (PAPR):   {(magnitude.max()/magnitude.mean()):.3f}")
+    print(f"  Min:                {mag_min:.6f}")
+    print(f"  Max:                {mag_max:.6f}")
+    print(f"  Moyenne:            {mag_mean:.6f}")
+    print(f"  Écart-type:         {mag_std:.6f}")
+    print(f"  Variation (PAPR):   {(mag_max/mag_mean):.3f}")
 
     # Vérification OQPSK constant envelope
-    if magnitude.std() < 0.1:
+    if mag_std < 0.1:
         print(f"  ✅ Enveloppe constante (OQPSK conforme)")
     else:
         print(f"  ⚠️  Enveloppe variable (PAPR élevé)")
@@ -160,7 +233,7 @@ def print_statistics(iq, sample_rate):
     print(f"\n🌀 Phase:")
     print(f"  Min:                {np.degrees(phase.min()):+.1f}°")
     print(f"  Max:                {np.degrees(phase.max()):+.1f}°")
-    print(f"  Transitions:        ~{len(np.where(np.abs(np.diff(phase)) > 1)[0])} (phase jumps)")
+    print(f"  Transitions:        ~{np.count_nonzero(np.abs(np.diff(phase)) > 1)} (phase jumps)")
 
     print("\n" + "="*70)
 
@@ -172,6 +245,8 @@ def main():
 
     parser.add_argument('wav_file', help='Fichier WAV à analyser')
     parser.add_argument('--save', help='Sauvegarder les graphiques (PNG)', metavar='output.png')
+    parser.add_argument('--raster-dpi', type=int, default=150,
+                       help='DPI des artistes rastérisés à la sauvegarde (défaut: 150)')
     parser.add_argument('--no-display', action='store_true', help='Ne pas afficher (juste sauvegarder)')
 
     args = parser.parse_args()
@@ -204,7 +279,7 @@ def main():
 
     # Sauvegarder ou afficher
     if args.save:
-        plt.savefig(args.save, dpi=150, bbox_inches='tight')
+        plt.savefig(args.save, dpi=args.raster_dpi, bbox_inches='tight')
         print(f"  ✓ Graphiques sauvegardés: {args.save}")
 
     if not args.no_display:
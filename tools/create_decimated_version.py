@@ -2,26 +2,24 @@
 """Create version at chip rate (1 sample/chip instead of 16)."""
 
 import numpy as np
+from scipy.signal import resample_poly
 
-# Read current version (16 sps)
-with open('test_frame_known.iq', 'rb') as f:
-    data = np.fromfile(f, dtype=np.float32)
+# Read current version (16 sps) — projection mémoire, pages à la demande
+data = np.memmap('test_frame_known.iq', dtype=np.float32, mode='r')
 
-iq = data[::2] + 1j * data[1::2]
+# Réinterprétation sans copie de l'entrelacement float32 en complex64
+iq = data.reshape(-1, 2).view(np.complex64).reshape(-1)
 print(f"Original: {len(iq)} samples (16 sps)")
 
-# Decimate by 16 to get 1 sample/chip
-decimated = iq[::16]
+# Décimation par 16 via filtre polyphase anti-repliement (upfirdn):
+# une décimation naïve iq[::16] replierait le hors-bande dans la bande
+decimated = resample_poly(iq, up=1, down=16).astype(np.complex64)
 print(f"Decimated: {len(decimated)} samples (1 sps = chip rate)")
 print(f"Expected: 38,400 chips × 2 channels = 76,800 chips")
 
-# Save decimated version
-data_out = np.zeros(len(decimated) * 2, dtype=np.float32)
-data_out[::2] = decimated.real
-data_out[1::2] = decimated.imag
-
+# Save decimated version (complex64 vu comme float32 entrelacé)
 with open('test_frame_chiprate.iq', 'wb') as f:
-    data_out.tofile(f)
+    decimated.view(np.float32).tofile(f)
 
 print(f"\n✓ Fichier décimé sauvegardé: test_frame_chiprate.iq")
 print(f"  Samples: {len(decimated)}")
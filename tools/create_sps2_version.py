@@ -2,26 +2,24 @@
 """Create version with sps=2 (2 samples/chip)."""
 
 import numpy as np
+from scipy.signal import resample_poly
 
-# Read sps=16 version
-with open('test_frame_known.iq', 'rb') as f:
-    data = np.fromfile(f, dtype=np.float32)
+# Read sps=16 version — projection mémoire, pages à la demande
+data = np.memmap('test_frame_known.iq', dtype=np.float32, mode='r')
 
-iq = data[::2] + 1j * data[1::2]
+# Réinterprétation sans copie de l'entrelacement float32 en complex64
+iq = data.reshape(-1, 2).view(np.complex64).reshape(-1)
 print(f"Original: {len(iq)} samples @ 614,400 Hz (sps=16)")
 
-# Decimate by 8 to get sps=2
-decimated = iq[::8]  # 614,400 / 8 = 76,800
+# Décimation par 8 via filtre polyphase anti-repliement (upfirdn):
+# une décimation naïve iq[::8] replierait le hors-bande dans la bande
+decimated = resample_poly(iq, up=1, down=8).astype(np.complex64)  # 614,400 / 8 = 76,800
 print(f"Decimated: {len(decimated)} samples @ 76,800 Hz (sps=2)")
 print(f"Expected: 38,400 chips × 2 sps = 76,800 samples")
 
-# Save
-data_out = np.zeros(len(decimated) * 2, dtype=np.float32)
-data_out[::2] = decimated.real
-data_out[1::2] = decimated.imag
-
+# Save (complex64 vu comme float32 entrelacé)
 with open('test_frame_sps2.iq', 'wb') as f:
-    data_out.tofile(f)
+    decimated.view(np.float32).tofile(f)
 
 print(f"\n✓ Fichier sps=2 sauvegardé: test_frame_sps2.iq")
 print(f"  Samples: {len(decimated)}")
@@ -6,12 +6,14 @@ Analyse le contenu complet d'une trame générée par sarsat_sgb
 
 import sys
 
+import numpy as np
+
 def bits_to_int(bits):
-    """Convertit une liste de bits en entier"""
-    value = 0
-    for bit in bits:
-        value = (value << 1) | bit
-    return value
+    """Convertit une séquence de bits en entier"""
+    bits = np.asarray(bits, dtype=np.uint8)
+    # np.packbits complète le dernier octet à droite: le décalage final
+    # annule ce remplissage, sans tableau intermédiaire
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big') >> ((-bits.size) % 8)
 
 def decode_15hex_id(frame_bits):
     """Décode l'identifiant 15 HEX (40 bits)"""
@@ -83,15 +85,14 @@ def decode_supplementary_data(frame_bits):
 def decode_frame(hex_string):
     """Décode une trame T.018 complète depuis sa représentation hexadécimale"""
 
-    # Convertir hex en bits
-    frame_bits = []
-    for hex_char in hex_string.replace(" ", "").replace("\n", ""):
-        nibble = int(hex_char, 16)
-        for i in range(3, -1, -1):
-            frame_bits.append((nibble >> i) & 1)
+    # Convertir hex en bits (dépaquetage C-level via np.unpackbits)
+    clean_hex = ''.join(hex_string.split())
+    if len(clean_hex) % 2:
+        clean_hex += '0'  # compléter au nibble pour bytes.fromhex
+    raw = np.frombuffer(bytes.fromhex(clean_hex), dtype=np.uint8)
 
     # Limiter à 252 bits (trame complète avec BCH)
-    frame_bits = frame_bits[:252]
+    frame_bits = np.unpackbits(raw)[:252]
 
     print("=" * 70)
     print(" DÉCODAGE COMPLET DE LA TRAME T.018 COSPAS-SARSAT")
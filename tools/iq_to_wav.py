@@ -10,27 +10,27 @@ Modes disponibles:
 
 import numpy as np
 import sys
-import struct
 import wave
 import argparse
 
+# Taille de bloc pour l'écriture en flux (échantillons par bloc)
+CHUNK_SAMPLES = 1 << 20
+
 def read_iq_file(filename):
     """Lit un fichier IQ (float32 interleaved I/Q)"""
     print(f"📖 Lecture du fichier IQ: {filename}")
 
-    with open(filename, 'rb') as f:
-        data = f.read()
-
-    # Convertir bytes → float32 array
-    num_floats = len(data) // 4
-    iq_data = struct.unpack(f'{num_floats}f', data)
+    # Projection mémoire en float32: seules les pages réellement touchées
+    # sont chargées, même pour des captures de plusieurs Go
+    data = np.memmap(filename, dtype=np.float32, mode='r')
 
-    # Séparer I et Q
-    i_samples = np.array(iq_data[0::2], dtype=np.float32)
-    q_samples = np.array(iq_data[1::2], dtype=np.float32)
+    # Séparer I et Q (vues sans copie)
+    i_samples = data[0::2]
+    q_samples = data[1::2]
 
-    # Former les échantillons complexes
-    complex_samples = i_samples + 1j * q_samples
+    # L'entrelacement float32 I,Q,I,Q... est la disposition mémoire de
+    # complex64: réinterprétation sans copie ni upcast en complex128
+    complex_samples = data.reshape(-1, 2).view(np.complex64).reshape(-1)
 
     num_samples = len(complex_samples)
     duration = num_samples / 400000.0
@@ -45,42 +45,44 @@ def write_wav_stereo_iq(filename, i_samples, q_samples, sample_rate=400000):
     """Écrit un fichier WAV stéréo (I sur gauche, Q sur droite)"""
     print(f"\n💾 Création WAV stéréo I/Q: {filename}")
 
-    # Normaliser à ±1.0
-    i_norm = i_samples / np.max(np.abs(i_samples))
-    q_norm = q_samples / np.max(np.abs(q_samples))
-
-    # Convertir en int16 (±32767)
-    i_int16 = (i_norm * 32767).astype(np.int16)
-    q_int16 = (q_norm * 32767).astype(np.int16)
+    num_samples = len(i_samples)
 
-    # Entrelacer I et Q pour stéréo
-    stereo_data = np.empty((len(i_int16) * 2,), dtype=np.int16)
-    stereo_data[0::2] = i_int16  # Canal gauche = I
-    stereo_data[1::2] = q_int16  # Canal droit = Q
+    # Passe 1: maxima globaux pour normaliser à ±32767
+    i_scale = 32767.0 / np.max(np.abs(i_samples))
+    q_scale = 32767.0 / np.max(np.abs(q_samples))
 
-    # Écrire fichier WAV
+    # Passe 2: écriture en flux par blocs (pas de buffer int16 complet)
     with wave.open(filename, 'wb') as wav_file:
         wav_file.setnchannels(2)  # Stéréo
         wav_file.setsampwidth(2)  # 16 bits
         wav_file.setframerate(sample_rate)
-        wav_file.writeframes(stereo_data.tobytes())
 
-    print(f"  ✓ WAV créé: {len(i_int16)} échantillons")
+        for start in range(0, num_samples, CHUNK_SAMPLES):
+            i_int16 = (i_samples[start:start+CHUNK_SAMPLES] * i_scale).astype(np.int16)
+            q_int16 = (q_samples[start:start+CHUNK_SAMPLES] * q_scale).astype(np.int16)
+
+            # Entrelacer I et Q pour stéréo
+            stereo_data = np.empty((len(i_int16) * 2,), dtype=np.int16)
+            stereo_data[0::2] = i_int16  # Canal gauche = I
+            stereo_data[1::2] = q_int16  # Canal droit = Q
+
+            wav_file.writeframes(stereo_data.tobytes())
+
+    print(f"  ✓ WAV créé: {num_samples} échantillons")
     print(f"  Format: Stéréo 16-bit, {sample_rate} Hz")
-    print(f"  Durée: {len(i_int16)/sample_rate:.3f} secondes")
+    print(f"  Durée: {num_samples/sample_rate:.3f} secondes")
 
 def write_wav_mono_am(filename, complex_samples, sample_rate=400000):
     """Écrit un fichier WAV mono (enveloppe AM = magnitude)"""
     print(f"\n💾 Création WAV mono AM (enveloppe): {filename}")
 
-    # Calculer la magnitude (enveloppe)
-    magnitude = np.abs(complex_samples)
+    # Calculer la magnitude (enveloppe) en float32, dans un buffer unique
+    magnitude = np.empty(len(complex_samples), dtype=np.float32)
+    np.abs(complex_samples, out=magnitude)
 
-    # Normaliser
-    magnitude_norm = magnitude / np.max(magnitude)
-
-    # Convertir en int16
-    audio_int16 = (magnitude_norm * 32767).astype(np.int16)
+    # Normaliser sur place (pas de temporaire) puis convertir en int16
+    np.multiply(magnitude, np.float32(32767.0 / magnitude.max()), out=magnitude)
+    audio_int16 = magnitude.astype(np.int16)
 
     # Écrire fichier WAV
     with wave.open(filename, 'wb') as wav_file:
@@ -97,15 +99,10 @@ def write_wav_mono_fm(filename, complex_samples, sample_rate=400000):
     """Écrit un fichier WAV mono (démodulation FM approximative)"""
     print(f"\n💾 Création WAV mono FM (démodulation): {filename}")
 
-    # Démodulation FM: dérivée de la phase
-    # angle(sample[n]) - angle(sample[n-1])
-    phase = np.angle(complex_samples)
-
-    # Calculer la différence de phase (dérivée)
-    phase_diff = np.diff(phase)
-
-    # Unwrap pour éviter les sauts de phase
-    phase_diff = np.unwrap(phase_diff)
+    # Démodulation FM: discriminateur par produit conjugué
+    # angle(sample[n] * conj(sample[n-1])) = différence de phase, déjà
+    # repliée dans (-π, π] — un seul passage, pas d'unwrap nécessaire
+    phase_diff = np.angle(complex_samples[1:] * np.conj(complex_samples[:-1]))
 
     # Normaliser
     if np.max(np.abs(phase_diff)) > 0:
@@ -127,6 +124,62 @@ def write_wav_mono_fm(filename, complex_samples, sample_rate=400000):
     print(f"  Format: Mono 16-bit, {sample_rate} Hz")
     print(f"  Durée: {len(audio_int16)/sample_rate:.3f} secondes")
 
+def write_wav_all(base_name, complex_samples, i_samples, q_samples, sample_rate=400000):
+    """Écrit les trois WAV (stéréo I/Q, AM, FM) en un seul passage partagé"""
+    stereo_file = f"{base_name}_stereo.wav"
+    am_file = f"{base_name}_am.wav"
+    fm_file = f"{base_name}_fm.wav"
+
+    print(f"\n💾 Création des trois WAV en un passage:")
+    print(f"  Stéréo I/Q: {stereo_file}")
+    print(f"  Mono AM:    {am_file}")
+    print(f"  Mono FM:    {fm_file}")
+
+    num_samples = len(complex_samples)
+
+    # Tampons partagés, calculés une seule fois: enveloppe (AM) et
+    # discriminateur FM par produit conjugué
+    magnitude = np.empty(num_samples, dtype=np.float32)
+    np.abs(complex_samples, out=magnitude)
+    phase_diff = np.angle(complex_samples[1:] * np.conj(complex_samples[:-1]))
+
+    # Maxima globaux pour la normalisation à ±32767
+    i_scale = 32767.0 / np.max(np.abs(i_samples))
+    q_scale = 32767.0 / np.max(np.abs(q_samples))
+    m_scale = 32767.0 / magnitude.max()
+    p_max = np.max(np.abs(phase_diff))
+    p_scale = 32767.0 / p_max if p_max > 0 else 32767.0
+
+    with wave.open(stereo_file, 'wb') as wav_stereo, \
+         wave.open(am_file, 'wb') as wav_am, \
+         wave.open(fm_file, 'wb') as wav_fm:
+
+        wav_stereo.setnchannels(2)  # Stéréo
+        wav_stereo.setsampwidth(2)  # 16 bits
+        wav_stereo.setframerate(sample_rate)
+        for wav_mono in (wav_am, wav_fm):
+            wav_mono.setnchannels(1)  # Mono
+            wav_mono.setsampwidth(2)  # 16 bits
+            wav_mono.setframerate(sample_rate)
+
+        # Un seul balayage par blocs alimente les trois fichiers
+        for start in range(0, num_samples, CHUNK_SAMPLES):
+            stop = start + CHUNK_SAMPLES
+
+            i_int16 = (i_samples[start:stop] * i_scale).astype(np.int16)
+            q_int16 = (q_samples[start:stop] * q_scale).astype(np.int16)
+            stereo_data = np.empty((len(i_int16) * 2,), dtype=np.int16)
+            stereo_data[0::2] = i_int16  # Canal gauche = I
+            stereo_data[1::2] = q_int16  # Canal droit = Q
+            wav_stereo.writeframes(stereo_data.tobytes())
+
+            wav_am.writeframes((magnitude[start:stop] * m_scale).astype(np.int16).tobytes())
+            wav_fm.writeframes((phase_diff[start:stop] * p_scale).astype(np.int16).tobytes())
+
+    print(f"  ✓ 3 WAV créés: {num_samples} échantillons")
+    print(f"  Format: 16-bit, {sample_rate} Hz")
+    print(f"  Durée: {num_samples/sample_rate:.3f} secondes")
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convertit un fichier IQ en WAV audio',
@@ -194,6 +247,19 @@ Exemples:
 
     # Générer les fichiers demandés
     try:
+        if args.all:
+            # Passage unique partageant enveloppe et phase différentielle
+            write_wav_all(base_name, complex_samples, i_samples, q_samples, args.rate)
+
+            print("\n✅ Conversion terminée avec succès!")
+            print("\n💡 Conseils d'écoute:")
+            print("   - Le signal OQPSK n'est PAS audible directement")
+            print("   - Utilisez un logiciel SDR pour visualiser le spectre")
+            print("   - Audacity: Analyser → Plot Spectrum (FFT)")
+            print("   - Le chip rate (38.4 kHz) est dans la bande audio")
+
+            return 0
+
         if do_stereo:
             output_file = f"{base_name}_stereo.wav" if args.all else f"{base_name}.wav"
             write_wav_stereo_iq(output_file, i_samples, q_samples, args.rate)
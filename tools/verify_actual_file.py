@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import numpy as np
+import os
 import sys
 
 # Check both locations
@@ -10,14 +11,16 @@ files = [
 
 for filename in files:
     try:
-        with open(filename, 'rb') as f:
-            data = np.fromfile(f, dtype=np.float32)
-        
-        if len(data) == 0:
+        if os.path.getsize(filename) == 0:
             print(f"❌ {filename}: VIDE")
             continue
+
+        # Projection mémoire: le fichier entier n'est jamais chargé alors
+        # que seuls ~5000 échantillons sont inspectés
+        data = np.memmap(filename, dtype=np.float32, mode='r')
             
-        iq = data[::2] + 1j * data[1::2]
+        # Réinterprétation sans copie de l'entrelacement float32 en complex64
+        iq = data.reshape(-1, 2).view(np.complex64).reshape(-1)
         
         print(f"\n{'='*70}")
         print(f"FICHIER: {filename}")
@@ -38,11 +41,9 @@ for filename in files:
         
         # Check if values are constant (no RRC)
         samples_per_chip = 16
-        chip_values = []
-        for i in range(1000, 2000, samples_per_chip):
-            chip_values.append(np.abs(iq[i]))
-        
-        std_dev = np.std(chip_values)
+        chip_values = np.abs(iq[1000:2000:samples_per_chip])
+
+        std_dev = chip_values.std()
         print(f"  Variabilité entre chips: σ={std_dev:.6f}")
         
         if std_dev < 0.01:
@@ -50,10 +51,12 @@ for filename in files:
         else:
             print(f"  ⚠ Amplitude VARIABLE (avec RRC?)")
             
-        # Show first samples
+        # Show first samples (extraits en une seule tranche stridée)
+        first_symbols = iq[0:80:16]
+        first_mags = np.abs(first_symbols)
         print(f"\nPremiers symboles (chaque 16 samples):")
-        for i in range(0, 80, 16):
-            print(f"  [{i:4d}] = {iq[i].real:+.3f} {iq[i].imag:+.3f}j  |mag|={np.abs(iq[i]):.4f}")
+        for i, (s, mag) in enumerate(zip(first_symbols, first_mags)):
+            print(f"  [{i*16:4d}] = {s.real:+.3f} {s.imag:+.3f}j  |mag|={mag:.4f}")
             
     except FileNotFoundError:
         print(f"\n❌ {filename}: FICHIER NON TROUVÉ")
@@ -8,37 +8,110 @@ et reconstruit la trame de 300 bits transmise.
 Usage: python3 verify_chips_dump.py [chips_file]
 """
 
-import struct
+import functools
+import mmap
+import os
 import sys
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:
+    # numba est optionnel: repli en Python pur (plus lent mais identique)
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+    prange = range
+    _HAVE_NUMBA = False
+
+# =============================================================================
+# CONSTANTES T.018 (format de dump fixe)
+# =============================================================================
+
+TOTAL_CHIPS = 38400       # chips par canal
+NUM_CHANNELS = 2          # I et Q interleaved
+DUMP_SIZE = TOTAL_CHIPS * NUM_CHANNELS
+CHIPS_PER_BIT = 256
+FRAME_BITS = 300
+PREAMBLE_BITS = 50
+PRN_I_SEED = 0x000001
+PRN_Q_SEED = 0x1AC1FC
+
+# Octet d'en-tête du dump: SoA (bloc I puis bloc Q) ou AoS (interleaved).
+# Les dumps hérités de 76 800 octets n'ont pas d'en-tête et sont AoS.
+DUMP_LAYOUT_AOS = 0xA0
+DUMP_LAYOUT_SOA = 0x50
+
+# Préfixes attendus des 64 premiers chips (T.018 Table 2.2), empaquetés
+# en octets pour comparaison directe avec la sortie de np.packbits
+_EXPECTED_I_PREFIX = np.frombuffer(bytes.fromhex("80000108421284A1"), dtype=np.uint8)
+_EXPECTED_Q_PREFIX = np.frombuffer(bytes.fromhex("3F8358BAD030F231"), dtype=np.uint8)
+
 # =============================================================================
 # GÉNÉRATEUR PRN (T.018 Table 2.2)
 # =============================================================================
 
+@njit(cache=True)
+def _prn_output_words(init_value, n_words):
+    """
+    Avance le LFSR par blocs de 23 pas (bit-parallèle / SWAR)
+
+    Le registre décale à droite avec sortie sur X0: les 23 prochains
+    chips sont exactement les bits 0..22 de l'état courant. Il suffit
+    donc d'émettre l'état comme mot de sortie, puis d'avancer de 23 pas
+    d'un coup.
+
+    Nouvel état après 23 pas: new[k] = fb du pas k = x[k] ^ x[k+18], où
+    x est le flux étendu (x[j] = état[j] pour j < 23, puis les feedbacks
+    eux-mêmes). D'où new[k] = état[k] ^ état[k+18] pour k < 5, et
+    new[k] = état[k] ^ new[k-5] sinon — une récurrence de pas 5 résolue
+    par 4 itérations XOR/décalage au lieu de 23 pas scalaires.
+    """
+    words = np.empty(n_words, dtype=np.uint32)
+    lfsr = init_value
+
+    for w in range(n_words):
+        words[w] = lfsr
+
+        base = lfsr ^ ((lfsr >> 18) & 0x1F)
+        new = base
+        for _ in range(4):
+            new = base ^ ((new << 5) & 0x7FFFE0)
+
+        lfsr = new & 0x7FFFFF
+
+    return words
+
+@functools.lru_cache(maxsize=None)
 def generate_prn_sequence(init_value, count):
     """
     Génère une séquence PRN selon T.018
     LFSR: X^23 + X^18 + 1
     Feedback: X0 ⊕ X18 → X22
     Output: X0 (Logic 1 → -1, Logic 0 → +1)
-    """
-    lfsr = init_value
-    prn = []
 
-    for _ in range(count):
-        # Output from LSB: Logic 1 → -1, Logic 0 → +1
-        prn.append(-1 if (lfsr & 1) else 1)
-
-        # Feedback: X0 ⊕ X18
-        feedback = (lfsr ^ (lfsr >> 18)) & 1
+    Les séquences sont déterministes: mémoïsées par (graine, longueur)
+    pour les vérifications en lot.
+    """
+    n_words = (count + 22) // 23
+    words = _prn_output_words(init_value, n_words)
 
-        # Shift right, insert feedback at X22
-        lfsr = (lfsr >> 1) | (feedback << 22)
+    # Dépaqueter les mots en chips: bit b du mot w = chip 23*w + b
+    bits = (words[:, None] >> np.arange(23, dtype=np.uint32)) & 1
 
-        # Mask to 23 bits
-        lfsr &= 0x7FFFFF
+    # Logic 1 → -1, Logic 0 → +1
+    chips = (1 - 2 * bits.astype(np.int8)).reshape(-1)[:count]
+    chips.setflags(write=False)  # tableau partagé entre appels via le cache
+    return chips
 
-    return prn
+# Séquences PRN de référence complètes (constantes fixées par T.018),
+# générées une seule fois au chargement du module et partagées en
+# lecture seule entre toutes les vérifications
+_PRN_I_FULL = generate_prn_sequence(PRN_I_SEED, TOTAL_CHIPS)
+_PRN_Q_FULL = generate_prn_sequence(PRN_Q_SEED, TOTAL_CHIPS)
 
 # =============================================================================
 # CONVERSION CHIPS → HEX
@@ -46,49 +119,57 @@ def generate_prn_sequence(init_value, count):
 
 def chips_to_hex(chips, count=64):
     """Convertit 64 chips en hex (comme dans T.018 Table 2.2)"""
-    hex_str = ""
-    for byte_idx in range(count // 8):
-        byte = 0
-        for bit in range(8):
-            chip_idx = byte_idx * 8 + bit
-            if chip_idx < len(chips):
-                # Logic 1 (chip=-1) → bit 1
-                if chips[chip_idx] == -1:
-                    byte |= (1 << (7 - bit))
-        hex_str += f"{byte:02X}"
-    return hex_str
+    # Logic 1 (chip=-1) → bit 1; np.packbits accepte le masque booléen
+    # directement et complète le dernier octet (asarray: une liste Python
+    # comparée à -1 donnerait le scalaire False, pas un masque)
+    return np.packbits(np.asarray(chips[:count]) == -1).tobytes().hex().upper()
+
+def group_hex(hex_str, group=4):
+    """Groupe une chaîne hex par blocs de 4 pour l'affichage"""
+    return ' '.join(hex_str[i:i+group] for i in range(0, len(hex_str), group))
 
 # =============================================================================
 # DÉSPREADING (RECONSTRUCTION DES BITS)
 # =============================================================================
 
+@njit(cache=True, parallel=True)
+def _despread_kernel(chips_spread, prn_reference, num_bits):
+    """
+    Corrélation bloc par bloc, parallélisée sur les bits (prange) —
+    aucune allocation de reshape ni de copie int16
+    """
+    bits = np.empty(num_bits, dtype=np.uint8)
+    for b in prange(num_bits):
+        base = b * CHIPS_PER_BIT
+        acc = 0
+        for k in range(CHIPS_PER_BIT):
+            acc += chips_spread[base + k] * prn_reference[base + k]
+        bits[b] = 1 if acc <= 0 else 0
+    return bits
+
 def despread_bits(chips_spread, prn_reference):
     """
-    Retrouve les bits à partir des chips après spreading
+    Retrouve les bits à partir des chips int8 après spreading
 
     Pour chaque bit (256 chips):
     - Corrélation positive avec PRN → bit = 0
     - Corrélation négative avec PRN → bit = 1
-    """
-    bits = []
-    num_bits = len(chips_spread) // 256
 
-    for bit_idx in range(num_bits):
-        start = bit_idx * 256
-        end = start + 256
-
-        # Chips pour ce bit
-        bit_chips = chips_spread[start:end]
-        prn_bit = prn_reference[start:end]
+    Retourne un ndarray uint8 de bits 0/1.
+    """
+    num_bits = chips_spread.size // CHIPS_PER_BIT
 
-        # Corrélation
-        correlation = sum(c * p for c, p in zip(bit_chips, prn_bit))
+    if _HAVE_NUMBA:
+        return _despread_kernel(chips_spread, prn_reference, num_bits)
 
-        # Décision
-        bit = 0 if correlation > 0 else 1
-        bits.append(bit)
+    # Repli NumPy: un produit-somme SIMD par bloc de 256 chips
+    # (accumulation int16 pour que la somme de 256 produits ±1 ne déborde pas)
+    chips = chips_spread[:num_bits * CHIPS_PER_BIT].astype(np.int16).reshape(-1, CHIPS_PER_BIT)
+    prn = prn_reference[:num_bits * CHIPS_PER_BIT].astype(np.int16).reshape(-1, CHIPS_PER_BIT)
+    correlation = np.einsum('ij,ij->i', chips, prn)
 
-    return bits
+    # Décision: corrélation positive → bit 0, sinon bit 1
+    return (correlation <= 0).astype(np.uint8)
 
 # =============================================================================
 # VÉRIFICATION DU FICHIER
@@ -97,113 +178,152 @@ def despread_bits(chips_spread, prn_reference):
 def verify_chip_dump(filename):
     """Vérifie le fichier de dump des chips"""
 
-    print("=" * 70)
-    print("VÉRIFICATION DU DUMP BINAIRE")
-    print("=" * 70)
-    print(f"Fichier: {filename}")
-    print()
+    # Sortie groupée: les lignes sont accumulées puis émises en un seul
+    # sys.stdout.write (un syscall au lieu d'un par print)
+    out = []
 
-    # 1. Lire le fichier
+    def flush():
+        sys.stdout.write('\n'.join(out) + '\n')
+        out.clear()
+
+    out.append("=" * 70)
+    out.append("VÉRIFICATION DU DUMP BINAIRE")
+    out.append("=" * 70)
+    out.append(f"Fichier: {filename}")
+    out.append("")
+
+    # 1. Projeter le fichier en mémoire (pas de copie noyau → userspace:
+    # NumPy lit directement le page cache)
     try:
         with open(filename, 'rb') as f:
-            chips_data = f.read()
+            # mmap refuse un fichier vide: la taille est relevée avant la
+            # projection pour qu'un dump vide passe par le chemin d'erreur
+            # de taille habituel
+            actual_size = os.fstat(f.fileno()).st_size
+            if actual_size:
+                chips_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     except FileNotFoundError:
-        print(f"❌ ERREUR: Fichier '{filename}' introuvable")
+        out.append(f"❌ ERREUR: Fichier '{filename}' introuvable")
+        flush()
         return False
 
-    # 2. Vérifier la taille
-    expected_size = 38400 * 2  # 38,400 chips × 2 canaux (I et Q)
-    actual_size = len(chips_data)
-
-    print(f"1. STRUCTURE DU FICHIER")
-    print(f"   Taille: {actual_size} octets")
-    print(f"   Attendu: {expected_size} octets")
+    # 2. Vérifier la taille (avec ou sans octet d'en-tête de format)
+    out.append(f"1. STRUCTURE DU FICHIER")
+    out.append(f"   Taille: {actual_size} octets")
+    out.append(f"   Attendu: {DUMP_SIZE} (AoS hérité) ou {DUMP_SIZE + 1} octets (avec en-tête)")
 
-    if actual_size != expected_size:
-        print(f"   ❌ ERREUR: Taille incorrecte")
+    if actual_size not in (DUMP_SIZE, DUMP_SIZE + 1):
+        out.append(f"   ❌ ERREUR: Taille incorrecte")
+        flush()
         return False
-    print(f"   ✓ OK")
-    print()
-
-    # 3. Extraire les chips I et Q (format interleaved)
-    i_chips = []
-    q_chips = []
-
-    for i in range(0, len(chips_data), 2):
-        i_chips.append(struct.unpack('b', chips_data[i:i+1])[0])
-        if i+1 < len(chips_data):
-            q_chips.append(struct.unpack('b', chips_data[i+1:i+2])[0])
-
-    print(f"2. EXTRACTION DES CHIPS")
-    print(f"   Chips I: {len(i_chips)}")
-    print(f"   Chips Q: {len(q_chips)}")
-
-    # Vérifier que toutes les valeurs sont ±1
-    valid_i = all(c in [-1, 1] for c in i_chips)
-    valid_q = all(c in [-1, 1] for c in q_chips)
-
-    if not (valid_i and valid_q):
-        print(f"   ❌ ERREUR: Valeurs invalides (doivent être +1 ou -1)")
+    out.append(f"   ✓ OK")
+    out.append("")
+
+    # 3. Extraire les chips I et Q
+    # Vue int8 sur le buffer puis tranches C-level; le format est
+    # auto-détecté via l'octet d'en-tête (les dumps hérités sont AoS)
+    raw = np.frombuffer(chips_data, dtype=np.int8)
+
+    if actual_size == DUMP_SIZE + 1:
+        layout = chips_data[0]
+        chips_arr = raw[1:]
+        if layout == DUMP_LAYOUT_SOA:
+            # SoA: chaque canal est contigu — pas d'accès stridé pour le
+            # déspreading
+            i_chips = chips_arr[:TOTAL_CHIPS]
+            q_chips = chips_arr[TOTAL_CHIPS:]
+            layout_desc = "38,400 chips I puis 38,400 chips Q (SoA)"
+        elif layout == DUMP_LAYOUT_AOS:
+            i_chips = chips_arr[0::2]
+            q_chips = chips_arr[1::2]
+            layout_desc = "38,400 chips I/Q interleaved (AoS)"
+        else:
+            out.append(f"   ❌ ERREUR: En-tête de format inconnu (0x{layout:02X})")
+            flush()
+            return False
+    else:
+        # Dump hérité sans en-tête: AoS interleaved
+        chips_arr = raw
+        i_chips = chips_arr[0::2]
+        q_chips = chips_arr[1::2]
+        layout_desc = "38,400 chips I/Q interleaved (AoS hérité)"
+
+    out.append(f"2. EXTRACTION DES CHIPS")
+    out.append(f"   Chips I: {len(i_chips)}")
+    out.append(f"   Chips Q: {len(q_chips)}")
+
+    # Validation et statistiques fusionnées: np.unique lit le buffer une
+    # seule fois et renvoie les valeurs présentes (validation ±1); les
+    # effectifs par canal sont dérivés dans la foulée et réutilisés en
+    # section 6 — une passe au lieu d'une par vérification
+    vals = np.unique(chips_arr)
+    if not np.all((vals == -1) | (vals == 1)):
+        out.append(f"   ❌ ERREUR: Valeurs invalides (doivent être +1 ou -1)")
+        flush()
         return False
-    print(f"   ✓ Toutes les valeurs sont ±1")
-    print()
+    out.append(f"   ✓ Toutes les valeurs sont ±1")
+    out.append("")
 
-    # 4. Vérifier les séquences PRN (64 premiers chips)
-    print(f"3. VÉRIFICATION SÉQUENCES PRN (T.018 Table 2.2)")
+    # Comptage par canal: (x+1)>>1 projette -1→0 et +1→1 (valeurs déjà
+    # validées), bincount renvoie [négatifs, positifs] en un balayage
+    i_neg, i_pos = (int(n) for n in np.bincount((i_chips + 1) >> 1, minlength=2))
+    q_neg, q_pos = (int(n) for n in np.bincount((q_chips + 1) >> 1, minlength=2))
 
-    i_hex = chips_to_hex(i_chips, 64)
-    q_hex = chips_to_hex(q_chips, 64)
+    # 4. Vérifier les séquences PRN (64 premiers chips)
+    out.append(f"3. VÉRIFICATION SÉQUENCES PRN (T.018 Table 2.2)")
 
-    expected_i = "8000010842128 4A1".replace(" ", "")
-    expected_q = "3F8358BAD030F231"
+    # Comparaison sur les préfixes empaquetés précalculés au chargement
+    # du module, sans reconstruction de chaînes hex
+    i_prefix = np.packbits(i_chips[:64] == -1)
+    q_prefix = np.packbits(q_chips[:64] == -1)
+    i_hex = i_prefix.tobytes().hex().upper()
+    q_hex = q_prefix.tobytes().hex().upper()
 
-    print(f"   Canal I (64 premiers chips):")
-    print(f"     Généré:  {i_hex[:4]} {i_hex[4:8]} {i_hex[8:12]} {i_hex[12:16]}")
-    print(f"     Attendu: 8000 0108 4212 84A1")
+    out.append(f"   Canal I (64 premiers chips):")
+    out.append(f"     Généré:  {group_hex(i_hex)}")
+    out.append(f"     Attendu: {group_hex(_EXPECTED_I_PREFIX.tobytes().hex().upper())}")
 
-    if i_hex == expected_i:
-        print(f"     ✓ MATCH (Normal I PRN)")
+    if np.array_equal(i_prefix, _EXPECTED_I_PREFIX):
+        out.append(f"     ✓ MATCH (Normal I PRN)")
     else:
-        print(f"     ❌ MISMATCH")
+        out.append(f"     ❌ MISMATCH")
+        flush()
         return False
 
-    print()
-    print(f"   Canal Q (64 premiers chips):")
-    print(f"     Généré:  {q_hex[:4]} {q_hex[4:8]} {q_hex[8:12]} {q_hex[12:16]}")
-    print(f"     Attendu: 3F83 58BA D030 F231")
+    out.append("")
+    out.append(f"   Canal Q (64 premiers chips):")
+    out.append(f"     Généré:  {group_hex(q_hex)}")
+    out.append(f"     Attendu: {group_hex(_EXPECTED_Q_PREFIX.tobytes().hex().upper())}")
 
-    if q_hex == expected_q:
-        print(f"     ✓ MATCH (Normal Q PRN)")
+    if np.array_equal(q_prefix, _EXPECTED_Q_PREFIX):
+        out.append(f"     ✓ MATCH (Normal Q PRN)")
     else:
-        print(f"     ❌ MISMATCH")
+        out.append(f"     ❌ MISMATCH")
+        flush()
         return False
 
-    print()
+    out.append("")
 
     # 5. Reconstruction de la trame
-    print(f"4. RECONSTRUCTION DE LA TRAME (300 bits)")
-    print()
-
-    # Générer les PRN de référence complets (38,400 chips)
-    PRN_I_full = generate_prn_sequence(0x000001, 38400)
-    PRN_Q_full = generate_prn_sequence(0x1AC1FC, 38400)
+    out.append(f"4. RECONSTRUCTION DE LA TRAME (300 bits)")
+    out.append("")
 
-    # Déspreading
-    i_bits = despread_bits(i_chips, PRN_I_full)
-    q_bits = despread_bits(q_chips, PRN_Q_full)
+    # Déspreading contre les PRN de référence précalculés au chargement
+    i_bits = despread_bits(i_chips, _PRN_I_FULL)
+    q_bits = despread_bits(q_chips, _PRN_Q_FULL)
 
     # Reconstruction trame 300 bits (interleaving I/Q)
     # T.018 §2.2.3.b: Odd bits → I, Even bits → Q
-    frame_300 = []
-    for i in range(150):
-        frame_300.append(i_bits[i])  # Bit 0, 2, 4, 6...
-        frame_300.append(q_bits[i])  # Bit 1, 3, 5, 7...
+    frame_300 = np.empty(FRAME_BITS, dtype=np.uint8)
+    frame_300[0::2] = i_bits[:FRAME_BITS // 2]  # Bit 0, 2, 4, 6...
+    frame_300[1::2] = q_bits[:FRAME_BITS // 2]  # Bit 1, 3, 5, 7...
 
-    frame_str = ''.join(str(b) for b in frame_300)
+    # Affichage: table de translation 0/1 → '0'/'1' sur les octets bruts
+    frame_str = frame_300.tobytes().translate(bytes.maketrans(b'\x00\x01', b'01')).decode()
 
     # Afficher la trame
-    print("   TRAME COMPLÈTE DE 300 BITS TRANSMISE:")
-    print()
+    out.append("   TRAME COMPLÈTE DE 300 BITS TRANSMISE:")
+    out.append("")
 
     for i in range(0, 300, 50):
         chunk = frame_str[i:i+50]
@@ -211,51 +331,48 @@ def verify_chip_dump(filename):
             label = "PRÉAMBULE (50 bits)"
         else:
             label = f"DONNÉES bits {i-50:3d}-{i-50+49:3d}"
-        print(f"   {chunk}  ← {label}")
+        out.append(f"   {chunk}  ← {label}")
 
-    print()
+    out.append("")
 
-    # Vérifier le préambule
-    preamble = frame_str[:50]
-    preamble_zeros = sum(1 for b in preamble if b == '0')
+    # Vérifier le préambule (comptage sur le ndarray, pas sur la chaîne)
+    preamble_zeros = int(np.count_nonzero(frame_300[:PREAMBLE_BITS] == 0))
 
-    print(f"5. VÉRIFICATION DU PRÉAMBULE")
-    print(f"   Bits à zéro: {preamble_zeros}/50")
+    out.append(f"5. VÉRIFICATION DU PRÉAMBULE")
+    out.append(f"   Bits à zéro: {preamble_zeros}/50")
 
-    if preamble_zeros == 50:
-        print(f"   ✓ PRÉAMBULE CORRECT (tous les bits à 0)")
+    if preamble_zeros == PREAMBLE_BITS:
+        out.append(f"   ✓ PRÉAMBULE CORRECT (tous les bits à 0)")
     else:
-        print(f"   ❌ ERREUR: Le préambule devrait être tous à 0")
+        out.append(f"   ❌ ERREUR: Le préambule devrait être tous à 0")
+        flush()
         return False
 
-    print()
+    out.append("")
 
     # 6. Statistiques
-    print(f"6. STATISTIQUES")
+    out.append(f"6. STATISTIQUES")
 
-    i_pos = sum(1 for c in i_chips if c == 1)
-    i_neg = sum(1 for c in i_chips if c == -1)
-    q_pos = sum(1 for c in q_chips if c == 1)
-    q_neg = sum(1 for c in q_chips if c == -1)
-
-    print(f"   Distribution I: +1={i_pos} ({i_pos/len(i_chips)*100:.1f}%), -1={i_neg} ({i_neg/len(i_chips)*100:.1f}%)")
-    print(f"   Distribution Q: +1={q_pos} ({q_pos/len(q_chips)*100:.1f}%), -1={q_neg} ({q_neg/len(q_chips)*100:.1f}%)")
-    print()
+    # Effectifs calculés en section 2, lors de la passe de validation
+    out.append(f"   Distribution I: +1={i_pos} ({i_pos/len(i_chips)*100:.1f}%), -1={i_neg} ({i_neg/len(i_chips)*100:.1f}%)")
+    out.append(f"   Distribution Q: +1={q_pos} ({q_pos/len(q_chips)*100:.1f}%), -1={q_neg} ({q_neg/len(q_chips)*100:.1f}%)")
+    out.append("")
 
     # Conclusion
-    print("=" * 70)
-    print("✅ LE DUMP BINAIRE EST CORRECT")
-    print("=" * 70)
-    print()
-    print("Résumé:")
-    print("  ✓ Structure: 76,800 octets (38,400 chips I/Q interleaved)")
-    print("  ✓ Valeurs: Toutes ±1")
-    print("  ✓ PRN I: Conforme à T.018 Table 2.2 (Normal I)")
-    print("  ✓ PRN Q: Conforme à T.018 Table 2.2 (Normal Q)")
-    print("  ✓ Préambule: 50 bits à 0")
-    print("  ✓ Distribution: ~50% +1, ~50% -1")
-    print()
-
+    out.append("=" * 70)
+    out.append("✅ LE DUMP BINAIRE EST CORRECT")
+    out.append("=" * 70)
+    out.append("")
+    out.append("Résumé:")
+    out.append(f"  ✓ Structure: {actual_size} octets ({layout_desc})")
+    out.append("  ✓ Valeurs: Toutes ±1")
+    out.append("  ✓ PRN I: Conforme à T.018 Table 2.2 (Normal I)")
+    out.append("  ✓ PRN Q: Conforme à T.018 Table 2.2 (Normal Q)")
+    out.append("  ✓ Préambule: 50 bits à 0")
+    out.append("  ✓ Distribution: ~50% +1, ~50% -1")
+    out.append("")
+
+    flush()
     return True
 
 # =============================================================================